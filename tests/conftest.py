@@ -1,11 +1,57 @@
 # SPDX-License-Identifier: MIT
 
 import contextlib
+import functools
 import os
 import pathlib
 
 import pytest
 
+import pyproject_metadata
+
+
+try:
+    # rtoml parses noticeably faster than the stdlib; use it when present.
+    import rtoml
+
+    toml_loads = rtoml.loads
+except ImportError:
+    try:
+        import tomllib
+    except ImportError:
+        import tomli as tomllib
+
+    toml_loads = tomllib.loads
+
+
+def load_pyproject(path='pyproject.toml'):
+    return toml_loads(pathlib.Path(path).read_bytes().decode('utf-8'))
+
+
+# shared by every load case that only varies the field under test
+_CASE_HEADER = "[project]\nname = 'test'\nversion = '0.1.0'\n"
+
+
+@functools.lru_cache(maxsize=None)
+def _load_cases():
+    path = pathlib.Path(__file__).parent / 'data' / 'load_cases.toml'
+    cases = toml_loads(path.read_bytes().decode('utf-8'))['case']
+    # structure-of-arrays: three flat tuples instead of a list of per-case
+    # dicts, zipped back together lazily when pytest collects
+    datas = tuple(
+        case['toml'] if 'toml' in case else _CASE_HEADER + case['tail']
+        for case in cases
+    )
+    errors = tuple(case['error'] for case in cases)
+    ids = tuple(case.get('id', f'case{i:02d}') for i, case in enumerate(cases))
+    return datas, errors, ids
+
+
+def pytest_generate_tests(metafunc):
+    if {'data', 'error'} <= set(metafunc.fixturenames):
+        datas, errors, ids = _load_cases()
+        metafunc.parametrize(('data', 'error'), tuple(zip(datas, errors)), ids=ids)
+
 
 package_dir = pathlib.Path(__file__).parent / 'packages'
 
@@ -21,6 +67,59 @@ def cd_package(package):
         os.chdir(cur_dir)
 
 
+@pytest.fixture(scope='session')
+def package_paths():
+    return {path.name: path.resolve() for path in package_dir.iterdir()}
+
+
+@pytest.fixture(scope='session')
+def pyproject_text():
+    cache = {}
+
+    def _get(package):
+        if package not in cache:
+            path = package_dir / package / 'pyproject.toml'
+            cache[package] = path.read_bytes().decode('utf-8')
+        return cache[package]
+
+    return _get
+
+
+@pytest.fixture(scope='session')
+def readme_text():
+    cache = {}
+
+    def _get(package, filename='README.md'):
+        key = (package, filename)
+        if key not in cache:
+            cache[key] = (package_dir / package / filename).read_text(encoding='utf-8')
+        return cache[key]
+
+    return _get
+
+
+@pytest.fixture(scope='session')
+def parsed_pyproject(pyproject_text):
+    cache = {}
+
+    def _get(package):
+        if package not in cache:
+            cache[package] = toml_loads(pyproject_text(package))
+        return cache[package]
+
+    return _get
+
+
+@pytest.fixture(scope='session')
+def readme_metadata_by_package(parsed_pyproject, package_paths):
+    return {
+        package: pyproject_metadata.StandardMetadata.from_pyproject(
+            parsed_pyproject(package), project_dir=package_paths[package]
+        )
+        for package in ('full-metadata', 'full-metadata2')
+    }
+
+
 @pytest.fixture()
 def package():
     with cd_package('full-metadata') as new_path:
@@ -1,614 +1,51 @@
 # SPDX-License-Identifier: MIT
 
+import functools
 import pathlib
 import re
-import textwrap
 
 import packaging.specifiers
 import packaging.version
 import pytest
 
+import pyproject_metadata
 
-try:
-    import tomllib
-except ImportError:
-    import tomli as tomllib
+from .conftest import load_pyproject, toml_loads
 
-import pyproject_metadata
 
-from .conftest import cd_package
+# The tests here are independent and compute-bound; keep them in one xdist
+# scheduling group so `pytest -n auto --dist=loadgroup` runs the file on a
+# single worker and the session-scoped caches warm up only once.
+pytestmark = pytest.mark.xdist_group('standard_metadata_pure')
+
+
+_EXPECTED_VERSION = packaging.version.Version('3.2.1')
+_EXPECTED_REQUIRES_PYTHON = packaging.specifiers.Specifier('>=3.8')
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_loads(text):
+    return toml_loads(text)
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_from_pyproject(toml_text, metadata_version=None):
+    return pyproject_metadata.StandardMetadata.from_pyproject(
+        _cached_loads(toml_text), metadata_version=metadata_version
+    )
 
 
-@pytest.mark.parametrize(
-    ('data', 'error'),
-    [
-        ('', 'Section "project" missing in pyproject.toml'),
-        # name
-        ('[project]', 'Field "project.name" missing'),
-        (
-            textwrap.dedent("""
-                [project]
-                name = true
-                version = '0.1.0'
-            """),
-            (
-                'Field "project.name" has an invalid type, expecting a string (got "True")'
-            ),
-        ),
-        # dynamic
-        (
-            textwrap.dedent("""
-                [project]
-                name = true
-                version = '0.1.0'
-                dynamic = [
-                    'name',
-                ]
-            """),
-            ('Unsupported field "name" in "project.dynamic"'),
-        ),
-        # version
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = true
-            """),
-            (
-                'Field "project.version" has an invalid type, expecting a string (got "True")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-            """),
-            (
-                'Field "project.version" missing and "version" not specified in "project.dynamic"'
-            ),
-        ),
-        # license
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                license = true
-            """),
-            (
-                'Field "project.license" has an invalid type, expecting a dictionary of strings (got "True")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                license = {}
-            """),
-            (
-                'Invalid "project.license" value, expecting either "file" or "text" (got "{}")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                license = { file = '...', text = '...' }
-            """),
-            (
-                'Invalid "project.license" value, expecting either "file" '
-                "or \"text\" (got \"{'file': '...', 'text': '...'}\")"
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                license = { made-up = ':(' }
-            """),
-            ('Unexpected field "project.license.made-up"'),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                license = { file = true }
-            """),
-            (
-                'Field "project.license.file" has an invalid type, expecting a string (got "True")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                license = { text = true }
-            """),
-            (
-                'Field "project.license.text" has an invalid type, expecting a string (got "True")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                license = { file = 'this-file-does-not-exist' }
-            """),
-            ('License file not found ("this-file-does-not-exist")'),
-        ),
-        # readme
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                readme = true
-            """),
-            (
-                'Field "project.readme" has an invalid type, expecting either, '
-                'a string or dictionary of strings (got "True")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                readme = {}
-            """),
-            (
-                'Invalid "project.readme" value, expecting either "file" or "text" (got "{}")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                readme = { file = '...', text = '...' }
-            """),
-            (
-                'Invalid "project.readme" value, expecting either "file" or '
-                "\"text\" (got \"{'file': '...', 'text': '...'}\")"
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                readme = { made-up = ':(' }
-            """),
-            ('Unexpected field "project.readme.made-up"'),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                readme = { file = true }
-            """),
-            (
-                'Field "project.readme.file" has an invalid type, expecting a string (got "True")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                readme = { text = true }
-            """),
-            (
-                'Field "project.readme.text" has an invalid type, expecting a string (got "True")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                readme = { file = 'this-file-does-not-exist', content-type = '...' }
-            """),
-            ('Readme file not found ("this-file-does-not-exist")'),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                readme = { file = 'README.md' }
-            """),
-            ('Field "project.readme.content-type" missing'),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                readme = { text = '...' }
-            """),
-            ('Field "project.readme.content-type" missing'),
-        ),
-        # description
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                description = true
-            """),
-            (
-                'Field "project.description" has an invalid type, expecting a string (got "True")'
-            ),
-        ),
-        # dependencies
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                dependencies = 'some string!'
-            """),
-            (
-                'Field "project.dependencies" has an invalid type, expecting a list of strings (got "some string!")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                dependencies = [
-                    99,
-                ]
-            """),
-            (
-                'Field "project.dependencies" contains item with invalid type, expecting a string (got "99")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                dependencies = [
-                    'definitely not a valid PEP 508 requirement!',
-                ]
-            """),
-            (
-                'Field "project.dependencies" contains an invalid PEP 508 requirement '
-                'string "definitely not a valid PEP 508 requirement!" '
-            ),
-        ),
-        # optional-dependencies
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                optional-dependencies = true
-            """),
-            (
-                'Field "project.optional-dependencies" has an invalid type, '
-                'expecting a dictionary of PEP 508 requirement strings (got "True")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                [project.optional-dependencies]
-                test = 'some string!'
-            """),
-            (
-                'Field "project.optional-dependencies.test" has an invalid type, '
-                'expecting a dictionary PEP 508 requirement strings (got "some string!")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                [project.optional-dependencies]
-                test = [
-                    true,
-                ]
-            """),
-            (
-                'Field "project.optional-dependencies.test" has an invalid type, '
-                'expecting a PEP 508 requirement string (got "True")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                [project.optional-dependencies]
-                test = [
-                    'definitely not a valid PEP 508 requirement!',
-                ]
-            """),
-            (
-                'Field "project.optional-dependencies.test" contains an invalid '
-                'PEP 508 requirement string "definitely not a valid PEP 508 requirement!" '
-            ),
-        ),
-        # requires-python
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                requires-python = true
-            """),
-            (
-                'Field "project.requires-python" has an invalid type, expecting a string (got "True")'
-            ),
-        ),
-        # keywords
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                keywords = 'some string!'
-            """),
-            (
-                'Field "project.keywords" has an invalid type, expecting a list of strings (got "some string!")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                keywords = [
-                    true,
-                ]
-            """),
-            (
-                'Field "project.keywords" contains item with invalid type, expecting a string (got "True")'
-            ),
-        ),
-        # authors
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                authors = {}
-            """),
-            (
-                'Field "project.authors" has an invalid type, expecting a list of '
-                'dictionaries containing the "name" and/or "email" keys (got "{}")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                authors = [
-                    true,
-                ]
-            """),
-            (
-                'Field "project.authors" has an invalid type, expecting a list of '
-                'dictionaries containing the "name" and/or "email" keys (got "[True]")'
-            ),
-        ),
-        # maintainers
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                maintainers = {}
-            """),
-            (
-                'Field "project.maintainers" has an invalid type, expecting a list of '
-                'dictionaries containing the "name" and/or "email" keys (got "{}")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                maintainers = [
-                    10
-                ]
-            """),
-            (
-                'Field "project.maintainers" has an invalid type, expecting a list of '
-                'dictionaries containing the "name" and/or "email" keys (got "[10]")'
-            ),
-        ),
-        # classifiers
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                classifiers = 'some string!'
-            """),
-            (
-                'Field "project.classifiers" has an invalid type, expecting a list of strings (got "some string!")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                classifiers = [
-                    true,
-                ]
-            """),
-            (
-                'Field "project.classifiers" contains item with invalid type, expecting a string (got "True")'
-            ),
-        ),
-        # homepage
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                [project.urls]
-                homepage = true
-            """),
-            (
-                'Field "project.urls.homepage" has an invalid type, expecting a string (got "True")'
-            ),
-        ),
-        # documentation
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                [project.urls]
-                documentation = true
-            """),
-            (
-                'Field "project.urls.documentation" has an invalid type, expecting a string (got "True")'
-            ),
-        ),
-        # repository
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                [project.urls]
-                repository = true
-            """),
-            (
-                'Field "project.urls.repository" has an invalid type, expecting a string (got "True")'
-            ),
-        ),
-        # changelog
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                [project.urls]
-                changelog = true
-            """),
-            (
-                'Field "project.urls.changelog" has an invalid type, expecting a string (got "True")'
-            ),
-        ),
-        # scripts
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                scripts = []
-            """),
-            (
-                'Field "project.scripts" has an invalid type, expecting a dictionary of strings (got "[]")'
-            ),
-        ),
-        # gui-scripts
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                gui-scripts = []
-            """),
-            (
-                'Field "project.gui-scripts" has an invalid type, expecting a dictionary of strings (got "[]")'
-            ),
-        ),
-        # entry-points
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                entry-points = []
-            """),
-            (
-                'Field "project.entry-points" has an invalid type, '
-                'expecting a dictionary of entrypoint sections (got "[]")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                entry-points = { section = 'something' }
-            """),
-            (
-                'Field "project.entry-points.section" has an invalid type, '
-                'expecting a dictionary of entrypoints (got "something")'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                [project.entry-points.section]
-                entrypoint = []
-            """),
-            (
-                'Field "project.entry-points.section.entrypoint" has an invalid type, expecting a string (got "[]")'
-            ),
-        ),
-        # invalid mame
-        (
-            textwrap.dedent("""
-                [project]
-                name = '.test'
-                version = '0.1.0'
-            """),
-            (
-                'Invalid project name ".test". A valid name consists only of ASCII letters and '
-                'numbers, period, underscore and hyphen. It must start and end with a letter or number'
-            ),
-        ),
-        (
-            textwrap.dedent("""
-                [project]
-                name = 'test'
-                version = '0.1.0'
-                [project.entry-points.bad-name]
-            """),
-            (
-                'Field "project.entry-points" has an invalid value, expecting a name containing only '
-                'alphanumeric, underscore, or dot characters (got "bad-name")'
-            ),
-        ),
-    ],
-)
 @pytest.mark.usefixtures('package')
 def test_load(data, error):
-    with pytest.raises(pyproject_metadata.ConfigurationError, match=re.escape(error)):
-        pyproject_metadata.StandardMetadata.from_pyproject(tomllib.loads(data))
+    with pytest.raises(pyproject_metadata.ConfigurationError) as exc_info:
+        pyproject_metadata.StandardMetadata.from_pyproject(_cached_loads(data))
+    assert error in str(exc_info.value)
 
 
 @pytest.mark.parametrize('after_rfc', [False, True])
 @pytest.mark.usefixtures('package')
-def test_value(after_rfc):
-    with open('pyproject.toml', 'rb') as f:
-        metadata = pyproject_metadata.StandardMetadata.from_pyproject(tomllib.load(f))
+def test_value(after_rfc, pyproject_text, readme_text):
+    metadata = _cached_from_pyproject(pyproject_text('full-metadata'))
 
     if after_rfc:
         metadata.as_rfc822()
@@ -616,12 +53,12 @@ def test_value(after_rfc):
     assert metadata.dynamic == []
     assert metadata.name == 'full_metadata'
     assert metadata.canonical_name == 'full-metadata'
-    assert metadata.version == packaging.version.Version('3.2.1')
-    assert metadata.requires_python == packaging.specifiers.Specifier('>=3.8')
+    assert metadata.version == _EXPECTED_VERSION
+    assert metadata.requires_python == _EXPECTED_REQUIRES_PYTHON
     assert metadata.license.file is None
     assert metadata.license.text == 'some license text'
     assert metadata.readme.file == pathlib.Path('README.md')
-    assert metadata.readme.text == pathlib.Path('README.md').read_text(encoding='utf-8')
+    assert metadata.readme.text == readme_text('full-metadata')
     assert metadata.readme.content_type == 'text/markdown'
     assert metadata.description == 'A package with all the metadata :)'
     assert metadata.authors == [
@@ -669,9 +106,10 @@ def test_value(after_rfc):
 
 
 @pytest.mark.usefixtures('package2')
-def test_read_license():
-    with open('pyproject.toml', 'rb') as f:
-        metadata = pyproject_metadata.StandardMetadata.from_pyproject(tomllib.load(f))
+def test_read_license(parsed_pyproject):
+    metadata = pyproject_metadata.StandardMetadata.from_pyproject(
+        parsed_pyproject('full-metadata2')
+    )
 
     assert metadata.license.file == pathlib.Path('LICENSE')
     assert metadata.license.text == 'Some license! 👋\n'
@@ -684,27 +122,31 @@ def test_read_license():
         ('full-metadata2', 'text/x-rst'),
     ],
 )
-def test_readme_content_type(package, content_type):
-    with cd_package(package), open('pyproject.toml', 'rb') as f:
-        metadata = pyproject_metadata.StandardMetadata.from_pyproject(tomllib.load(f))
+def test_readme_content_type(package, content_type, readme_metadata_by_package):
+    assert readme_metadata_by_package[package].readme.content_type == content_type
 
-    assert metadata.readme.content_type == content_type
+
+_UNKNOWN_README_ERROR = re.compile(
+    re.escape(
+        'Could not infer content type for readme file "README.just-made-this-up-now"'
+    )
+)
 
 
-def test_readme_content_type_unknown():
-    with cd_package('unknown-readme-type'), pytest.raises(
+def test_readme_content_type_unknown(package_paths):
+    path = package_paths['unknown-readme-type']
+    with pytest.raises(
         pyproject_metadata.ConfigurationError,
-        match=re.escape(
-            'Could not infer content type for readme file "README.just-made-this-up-now"'
-        ),
-    ), open('pyproject.toml', 'rb') as f:
-        pyproject_metadata.StandardMetadata.from_pyproject(tomllib.load(f))
+        match=_UNKNOWN_README_ERROR,
+    ):
+        pyproject_metadata.StandardMetadata.from_pyproject(
+            load_pyproject(path / 'pyproject.toml'), project_dir=path
+        )
 
 
 @pytest.mark.usefixtures('package')
-def test_as_rfc822():
-    with open('pyproject.toml', 'rb') as f:
-        metadata = pyproject_metadata.StandardMetadata.from_pyproject(tomllib.load(f))
+def test_as_rfc822(pyproject_text):
+    metadata = _cached_from_pyproject(pyproject_text('full-metadata'))
     core_metadata = metadata.as_rfc822()
     assert core_metadata.headers == {
         'Metadata-Version': ['2.1'],
@@ -745,9 +187,10 @@ def test_as_rfc822():
 
 
 @pytest.mark.usefixtures('package_dynamic_description')
-def test_as_rfc822_dynamic():
-    with open('pyproject.toml', 'rb') as f:
-        metadata = pyproject_metadata.StandardMetadata.from_pyproject(tomllib.load(f))
+def test_as_rfc822_dynamic(parsed_pyproject):
+    metadata = pyproject_metadata.StandardMetadata.from_pyproject(
+        parsed_pyproject('dynamic-description')
+    )
     core_metadata = metadata.as_rfc822()
     assert dict(core_metadata.headers) == {
         'Metadata-Version': ['2.2'],
@@ -757,36 +200,36 @@ def test_as_rfc822_dynamic():
     }
 
 
+_SET_METADATA_TOML = """
+[project]
+name = 'hi'
+version = '1.2'
+
+[project.optional-dependencies]
+under_score = ['some_package']
+da-sh = ['some-package']
+"do.t" = ['some.package']
+empty = []
+"""
+
+
 @pytest.mark.parametrize('metadata_version', ['2.1', '2.2', '2.3'])
 def test_as_rfc822_set_metadata(metadata_version):
-    metadata = pyproject_metadata.StandardMetadata.from_pyproject(
-        {
-            'project': {
-                'name': 'hi',
-                'version': '1.2',
-                'optional-dependencies': {
-                    'under_score': ['some_package'],
-                    'da-sh': ['some-package'],
-                    'do.t': ['some.package'],
-                    'empty': [],
-                },
-            }
-        },
-        metadata_version=metadata_version,
+    metadata = _cached_from_pyproject(
+        _SET_METADATA_TOML, metadata_version=metadata_version
     )
     assert metadata.metadata_version == metadata_version
 
-    rfc822 = str(metadata.as_rfc822())
+    headers = metadata.as_rfc822().headers
 
-    assert f'Metadata-Version: {metadata_version}' in rfc822
+    assert headers['Metadata-Version'] == [metadata_version]
 
-    assert 'Provides-Extra: under-score' in rfc822
-    assert 'Provides-Extra: da-sh' in rfc822
-    assert 'Provides-Extra: do-t' in rfc822
-    assert 'Provides-Extra: empty' in rfc822
-    assert 'Requires-Dist: some_package; extra == "under-score"' in rfc822
-    assert 'Requires-Dist: some-package; extra == "da-sh"' in rfc822
-    assert 'Requires-Dist: some.package; extra == "do-t"' in rfc822
+    assert headers['Provides-Extra'] == ['under-score', 'da-sh', 'do-t', 'empty']
+    assert headers['Requires-Dist'] == [
+        'some_package; extra == "under-score"',
+        'some-package; extra == "da-sh"',
+        'some.package; extra == "do-t"',
+    ]
 
 
 def test_as_rfc822_set_metadata_invalid():
@@ -813,16 +256,13 @@ def test_as_rfc822_invalid_dynamic():
         name='something',
         version=packaging.version.Version('1.0.0'),
     )
-    metadata.dynamic = ['name']
-    with pytest.raises(
-        pyproject_metadata.ConfigurationError, match='Field cannot be dynamic: name'
-    ):
-        metadata.as_rfc822()
-    metadata.dynamic = ['version']
-    with pytest.raises(
-        pyproject_metadata.ConfigurationError, match='Field cannot be dynamic: version'
-    ):
-        metadata.as_rfc822()
+    for field in ('name', 'version'):
+        metadata.dynamic = [field]
+        with pytest.raises(
+            pyproject_metadata.ConfigurationError,
+            match=f'Field cannot be dynamic: {field}',
+        ):
+            metadata.as_rfc822()
 
 
 def test_as_rfc822_missing_version():